@@ -1,10 +1,12 @@
 from functools import lru_cache
 
+from apps.agent.core.cache import get_cache, is_closed_range, make_key
 from apps.agent.core.config import settings
+from apps.agent.core.deadline import Deadline
 from apps.agent.llm.graph_agentic import build_agentic_graph
 from apps.agent.llm.graph_deterministic import build_deterministic_agent_graph
 from apps.agent.schemas.responses import SummaryRequest, SummaryResponse
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException
 
 router = APIRouter(prefix="/v1/agent", tags=["agent"])
 
@@ -30,11 +32,34 @@ def _select_graph():
 
 
 @router.post("/summary", response_model=SummaryResponse, status_code=200)
-def summary(body: SummaryRequest):
-    """Generate a summary based on user stats and KPIs."""
+def summary(
+    body: SummaryRequest,
+    x_deadline_ms: int | None = Header(default=None, gt=0),
+):
+    """Generate a summary based on user stats and KPIs.
 
+    The latency budget is taken from `deadline_ms` in the body, then the
+    `X-Deadline-Ms` header, then AGENT_DEFAULT_DEADLINE_MS. Non degraded
+    summaries of closed date ranges are served from the shared cache.
+    """
+
+    deadline_ms = body.deadline_ms or x_deadline_ms or settings.AGENT_DEFAULT_DEADLINE_MS
+    deadline = Deadline.from_budget_ms(deadline_ms)
     thread_id = f"{body.user_id}:{body.start}:{body.end}"
 
+    cache_key = make_key(
+        "summary", settings.AGENT_MODE, body.user_id, body.start, body.end, body.goal, body.question
+    )
+    cacheable = is_closed_range(body.start, body.end)
+    cached = get_cache().get(cache_key) if cacheable else None
+    if cached is not None:
+        return SummaryResponse(
+            answer=cached["answer"],
+            evidence=cached["evidence"],
+            sources=[{"type": "api", "endpoint": "/stats"}],
+            usage={"mode": "graph", "deadline_ms": deadline_ms, "degradations": [], "cached": True},
+        )
+
     try:
         result = _select_graph().invoke(
             {
@@ -43,8 +68,11 @@ def summary(body: SummaryRequest):
                 "start": body.start,
                 "end": body.end,
                 "goal": body.goal,
+                "degradations": [],
+                "fresh_rows": False,
+                "fresh_kpis": False,
             },
-            config={"configurable": {"thread_id": thread_id}},
+            config={"configurable": {"thread_id": thread_id, **deadline.to_configurable()}},
         )
     except HTTPException:
         raise
@@ -53,9 +81,19 @@ def summary(body: SummaryRequest):
             status_code=500, detail=f"Graph execution failed: {exception}"
         ) from exception
 
+    answer = result.get("answer", "")
+    degradations = result.get("degradations", [])
+    if cacheable and not degradations:
+        get_cache().set(cache_key, {"answer": answer, "evidence": result.get("kpis")})
+
     return SummaryResponse(
-        answer=result.get("answer", ""),
+        answer=answer,
         evidence=result.get("kpis"),
         sources=[{"type": "api", "endpoint": "/stats"}],
-        usage={"mode": "graph"},
+        usage={
+            "mode": "graph",
+            "deadline_ms": deadline_ms,
+            "degradations": degradations,
+            "cached": False,
+        },
     )
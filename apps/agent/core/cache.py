@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Any
+
+from apps.agent.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bump to invalidate every cached entry after a change in the cached payloads
+CACHE_VERSION = 1
+
+_RAW_PREFIX = b"j"
+_ZLIB_PREFIX = b"z"
+_COMPRESS_MIN_BYTES = 1024
+
+
+def make_key(namespace: str, *parts: Any) -> str:
+    """Build a versioned cache key, e.g. ``agent:v1:rows:<sha1>``.
+
+    Args:
+        namespace (str): Kind of cached value ("rows", "kpis", "summary", "prompt").
+        *parts (Any): JSON serializable values identifying the entry.
+    Returns:
+        str: The cache key.
+    """
+    raw = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    return f"agent:v{CACHE_VERSION}:{namespace}:{digest}"
+
+
+def is_closed_range(start: str, end: str) -> bool:
+    """True when the ISO date range ended before yesterday.
+
+    Stats of an open range (ending yesterday or later, a day of margin for
+    users in other timezones) still change as workouts are logged, so they
+    are not cached. Unparseable dates are treated as open.
+    """
+    try:
+        return (
+            date.fromisoformat(start) <= date.fromisoformat(end) < date.today() - timedelta(days=1)
+        )
+    except (TypeError, ValueError):
+        return False
+
+
+def dumps(value: Any) -> bytes:
+    """Serialize a value as compact JSON, zlib compressed when it is large."""
+    raw = json.dumps(value, separators=(",", ":"), default=str).encode("utf-8")
+    if len(raw) >= _COMPRESS_MIN_BYTES:
+        return _ZLIB_PREFIX + zlib.compress(raw)
+    return _RAW_PREFIX + raw
+
+
+def loads(blob: bytes) -> Any:
+    """Inverse of `dumps`."""
+    prefix, payload = blob[:1], blob[1:]
+    if prefix == _ZLIB_PREFIX:
+        payload = zlib.decompress(payload)
+    return json.loads(payload)
+
+
+class CacheBackend:
+    """Base cache backend storing values serialized with `dumps`.
+
+    Backend errors are logged and treated as misses: the cache must never
+    break a request.
+    """
+
+    name = "base"
+
+    def get(self, key: str) -> Any | None:
+        try:
+            blob = self._get(key)
+            return None if blob is None else loads(blob)
+        except Exception as error:
+            logger.warning("Cache %s get failed for %s: %s", self.name, key, error)
+            return None
+
+    def set(self, key: str, value: Any, ttl: int | None = None) -> None:
+        ttl = settings.AGENT_CACHE_TTL_S if ttl is None else ttl
+        try:
+            self._set(key, dumps(value), ttl)
+        except Exception as error:
+            logger.warning("Cache %s set failed for %s: %s", self.name, key, error)
+
+    def _get(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    def _set(self, key: str, blob: bytes, ttl: int) -> None:
+        raise NotImplementedError
+
+
+class NullCache(CacheBackend):
+    """Cache disabled: every lookup is a miss."""
+
+    name = "none"
+
+    def _get(self, key: str) -> bytes | None:
+        return None
+
+    def _set(self, key: str, blob: bytes, ttl: int) -> None:
+        return None
+
+
+class InProcessCache(CacheBackend):
+    """LRU cache local to the worker process."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            blob, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return blob
+
+    def _set(self, key: str, blob: bytes, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (blob, time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+class SQLiteCache(CacheBackend):
+    """Cache shared by every worker on the host, backed by SQLite in WAL mode.
+
+    WAL lets readers in other processes proceed while one worker writes.
+    Each thread keeps its own connection (and its own write counter for the
+    periodic pruning). A writer lock is waited for at most ``timeout`` seconds,
+    then the call counts as a miss.
+    """
+
+    name = "sqlite"
+    _PRUNE_EVERY = 256
+
+    def __init__(self, path: str, timeout: float = 0.05) -> None:
+        self._path = path
+        self._timeout = timeout
+        self._local = threading.local()
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self._path, timeout=self._timeout, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.writes = 0
+        return connection
+
+    def _get(self, key: str) -> bytes | None:
+        row = (
+            self._connection()
+            .execute("SELECT value FROM cache WHERE key = ? AND expires_at > ?", (key, time.time()))
+            .fetchone()
+        )
+        return row[0] if row else None
+
+    def _set(self, key: str, blob: bytes, ttl: int) -> None:
+        connection = self._connection()
+        now = time.time()
+        connection.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, blob, now + ttl),
+        )
+        self._local.writes += 1
+        if self._local.writes % self._PRUNE_EVERY == 0:
+            connection.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+
+
+class RedisCache(CacheBackend):
+    """Cache shared across hosts through the Redis protocol.
+
+    Takes any client exposing ``get`` and ``set(key, value, ex=...)``, so tests
+    pass the local stand-in ``fakeredis.FakeRedis()`` (requirements-dev.txt).
+    """
+
+    name = "redis"
+
+    def __init__(self, client) -> None:
+        self._client = client
+
+    @classmethod
+    def from_url(cls, url: str, timeout: float = 0.05) -> RedisCache:
+        """Connect to ``url``, failing fast if the server does not answer.
+
+        ``timeout`` (seconds) bounds connecting and every command, so an
+        unresponsive server costs a request at most that long (then a miss).
+        """
+        import redis
+
+        client = redis.Redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+        client.ping()
+        return cls(client)
+
+    def _get(self, key: str) -> bytes | None:
+        return self._client.get(key)
+
+    def _set(self, key: str, blob: bytes, ttl: int) -> None:
+        self._client.set(key, blob, ex=ttl)
+
+
+def _make_cache() -> CacheBackend:
+    """Instanciate the cache backend based on settings.
+
+    A shared backend that cannot be built raises instead of silently falling
+    back to a per-worker cache.
+    """
+
+    backend = settings.AGENT_CACHE_BACKEND.lower()
+    timeout = settings.AGENT_CACHE_TIMEOUT_MS / 1000
+    if backend == "memory":
+        return InProcessCache(settings.AGENT_CACHE_MAX_ENTRIES)
+    if backend == "sqlite":
+        return SQLiteCache(settings.AGENT_CACHE_SQLITE_PATH, timeout=timeout)
+    if backend == "redis":
+        return RedisCache.from_url(settings.AGENT_CACHE_REDIS_URL, timeout=timeout)
+    if backend == "none":
+        return NullCache()
+    raise ValueError(f"Unknown AGENT_CACHE_BACKEND: {settings.AGENT_CACHE_BACKEND}")
+
+
+@lru_cache(maxsize=1)
+def get_cache() -> CacheBackend:
+    """Singleton cache backend instance (built at startup, see main.py)."""
+    return _make_cache()
@@ -1,3 +1,4 @@
+from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -22,5 +23,29 @@ class Settings(BaseSettings):
 
     AGENT_GYM_PROMPT_NAME: str = None
 
+    # Latency budget (ms) applied when the request does not set one. None = no deadline.
+    AGENT_DEFAULT_DEADLINE_MS: int | None = None
+    # Minimum budget (ms) left to attempt an LLM call; below it the nodes degrade.
+    AGENT_LLM_MIN_BUDGET_MS: int = 500
+    # Minimum budget (ms) left to call the Statistics API; below it cached KPIs are used.
+    AGENT_FETCH_MIN_BUDGET_MS: int = 100
+    # Budget (ms) held back from agentic LLM calls so the deterministic fallback can still run.
+    AGENT_FALLBACK_RESERVE_MS: int = 300
+
+    # Cache for rows, KPIs, summaries and prompts: memory | sqlite | redis | none
+    AGENT_CACHE_BACKEND: str = "memory"
+    AGENT_CACHE_TTL_S: int = 300
+    AGENT_CACHE_MAX_ENTRIES: int = 1024
+    AGENT_CACHE_SQLITE_PATH: str = "/tmp/agent-cache.sqlite3"
+    AGENT_CACHE_REDIS_URL: str = "redis://redis:6379/0"
+    # Max wait (ms) on the SQLite write lock / Redis socket before a cache call counts as a miss
+    AGENT_CACHE_TIMEOUT_MS: int = 50
+
+    @field_validator("AGENT_DEFAULT_DEADLINE_MS", mode="before")
+    @classmethod
+    def _empty_deadline_is_none(cls, value):
+        """`AGENT_DEFAULT_DEADLINE_MS=` (empty) means no deadline."""
+        return None if value == "" else value
+
 
 settings = Settings()
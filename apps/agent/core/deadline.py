@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import time
+
+from langchain_core.runnables import RunnableConfig
+
+DEADLINE_CONFIG_KEY = "deadline_at"
+
+
+class Deadline:
+    """Latency budget of a single request, shared by every graph node.
+
+    The absolute expiry (``time.monotonic`` based) travels through the graph
+    config under ``configurable.deadline_at`` so each node can rebuild it.
+    """
+
+    def __init__(self, expires_at: float | None = None) -> None:
+        self.expires_at = expires_at
+
+    @classmethod
+    def from_budget_ms(cls, budget_ms: int | None) -> Deadline:
+        """Start a deadline that expires ``budget_ms`` milliseconds from now."""
+        if not budget_ms:
+            return cls()
+        return cls(time.monotonic() + budget_ms / 1000)
+
+    @classmethod
+    def from_config(cls, config: RunnableConfig | None) -> Deadline:
+        """Rebuild the deadline stored in the graph config (if any)."""
+        configurable = (config or {}).get("configurable") or {}
+        return cls(configurable.get(DEADLINE_CONFIG_KEY))
+
+    @property
+    def enabled(self) -> bool:
+        return self.expires_at is not None
+
+    def remaining(self) -> float | None:
+        """Seconds left before the deadline, or None when there is no deadline."""
+        if not self.enabled:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def has_at_least(self, budget_ms: int) -> bool:
+        """True when there is no deadline or at least ``budget_ms`` are left."""
+        remaining = self.remaining()
+        return remaining is None or remaining * 1000 >= budget_ms
+
+    def timeout(self, min_ms: int = 0, reserve_ms: int = 0) -> float | None:
+        """Timeout (seconds) for a blocking call, floored at ``min_ms``.
+
+        ``reserve_ms`` is held back from the remaining budget for work that must
+        still run after the call (e.g. a fallback). None when there is no
+        deadline, so callers keep their default timeout.
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return None
+        return max(remaining - reserve_ms / 1000, min_ms / 1000)
+
+    def to_configurable(self) -> dict:
+        """Values to merge into the graph ``configurable`` dict."""
+        return {DEADLINE_CONFIG_KEY: self.expires_at}
@@ -13,3 +13,9 @@ CONTENT_ERROR_KPIS_REQUIRE_ROWS = "ERROR: compute_kpis requiere 'rows' (llama an
 CONTENT_ERROR_KPIS_REQUIRED = (
     "ERROR: compute_conclusions requiere 'kpis' (llama antes a compute_kpis)."
 )
+CONTENT_NO_CONCLUSIONS = "Sin conclusiones."
+
+# Degradations applied when the request deadline runs out (reported in `usage`)
+DEGRADATION_CACHED_KPIS = "cached_kpis"
+DEGRADATION_SKIP_LLM_REWRITE = "skip_llm_rewrite"
+DEGRADATION_AGENTIC_LOOP_CAPPED = "agentic_loop_capped"
@@ -1,12 +1,19 @@
 from apps.agent.core.config import settings
 
 
-def _make_llm():
-    """Instanciate a LLM based on settings."""
+def _make_llm(timeout: float | None = None):
+    """Instanciate a LLM based on settings.
+
+    Args:
+        timeout (float | None): Request timeout in seconds, None for the client default.
+    """
 
     if settings.LLM_PROVIDER == "openai":
         from langchain_openai import ChatOpenAI
 
+        if timeout is not None:
+            # No retries: a retry would never fit in the remaining budget
+            return ChatOpenAI(model="gpt-4o-mini", temperature=0, timeout=timeout, max_retries=0)
         return ChatOpenAI(model="gpt-4o-mini", temperature=0)
 
     return None
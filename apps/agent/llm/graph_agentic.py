@@ -4,13 +4,18 @@ import json
 import logging
 
 from apps.agent.core.config import settings
+from apps.agent.core.deadline import Deadline
 from apps.agent.llm.constants import (
     CONTENT_ERROR_KPIS_REQUIRE_ROWS,
     CONTENT_ERROR_KPIS_REQUIRED,
+    CONTENT_NO_CONCLUSIONS,
+    DEGRADATION_AGENTIC_LOOP_CAPPED,
+    DEGRADATION_CACHED_KPIS,
     SYSTEM_PROMPT,
 )
 from apps.agent.llm.factory import _make_llm
 from apps.agent.llm.prompt import retrieve_prompt
+from apps.agent.llm.tools import compute_conclusions, compute_kpis, fetch_stats
 from apps.agent.llm.tools_registry import TOOLS
 from apps.agent.schemas.agent import AgentState
 from langchain_core.messages import (
@@ -19,30 +24,35 @@ from langchain_core.messages import (
     SystemMessage,
     ToolMessage,
 )
+from langchain_core.runnables import RunnableConfig
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import END, START, StateGraph
+from openai import APITimeoutError
 
 logger = logging.getLogger(__name__)
 
 
-def _ensure_messages(state: AgentState) -> list:
+def _ensure_messages(state: AgentState, fetch_prompt: bool = True) -> list:
     """Ensure the state has a messages list, initializing if necessary.
 
     Args:
         state (AgentState): The current state of the agent.
+        fetch_prompt (bool): Retrieve the system prompt from Langfuse, otherwise
+            (e.g. out of time) use SYSTEM_PROMPT.
     Returns:
         list: List of BaseMessage objects.
     """
 
     messages = state.get("messages") or []
-    prompt = retrieve_prompt(settings.AGENT_GYM_PROMPT_NAME)
-    if not prompt:
-        logger.info(
-            "retrieve_prompt failed for AGENT_GYM_PROMPT_NAME=%s", settings.AGENT_GYM_PROMPT_NAME
-        )
-        prompt = SYSTEM_PROMPT
-
     if not messages:
+        prompt = retrieve_prompt(settings.AGENT_GYM_PROMPT_NAME) if fetch_prompt else None
+        if not prompt:
+            logger.info(
+                "Using SYSTEM_PROMPT instead of AGENT_GYM_PROMPT_NAME=%s",
+                settings.AGENT_GYM_PROMPT_NAME,
+            )
+            prompt = SYSTEM_PROMPT
+
         user_text = (
             f"Pregunta: {state.get('input','')}\n"
             f"Usuario={state.get('user_id')}, "
@@ -54,29 +64,92 @@ def _ensure_messages(state: AgentState) -> list:
     return messages
 
 
-def node_llm(state: AgentState) -> dict:
+def _degraded_answer(state: AgentState, messages: list, config: RunnableConfig) -> dict:
+    """Close the loop without the LLM, running the deterministic pipeline instead.
+
+    Reuses the rows/KPIs already in state and only runs the missing steps of
+    fetch_stats -> compute_kpis -> compute_conclusions. KPIs not built from rows
+    fetched in this run come from the thread checkpoint of an earlier run and
+    are reported as 'cached_kpis'.
+
+    Args:
+        state (AgentState): The current state of the agent.
+        messages (list): Messages so far.
+        config (RunnableConfig): Graph config carrying the request deadline.
+    Returns:
+        dict: Updated state with the answer and the applied degradations.
+    """
+
+    degradations = (state.get("degradations") or []) + [DEGRADATION_AGENTIC_LOOP_CAPPED]
+    rows, kpis = state.get("rows"), state.get("kpis")
+    fresh_rows, fresh_kpis = bool(state.get("fresh_rows")), bool(state.get("fresh_kpis"))
+
+    if rows is None and kpis is None:
+        rows = fetch_stats.invoke(
+            {"user_id": state["user_id"], "start": state["start"], "end": state["end"]},
+            config=config,
+        )
+        fresh_rows = True
+    if rows is not None and (kpis is None or (fresh_rows and not fresh_kpis)):
+        kpis, fresh_kpis = compute_kpis.invoke({"rows": rows}), fresh_rows
+    if not fresh_kpis:
+        degradations.append(DEGRADATION_CACHED_KPIS)
+
+    concl = compute_conclusions.invoke({"kpis": kpis, "goal": state.get("goal") or "general"})
+    answer = concl.get("advice", CONTENT_NO_CONCLUSIONS)
+
+    return {
+        "messages": messages + [AIMessage(content=answer)],
+        "answer": answer,
+        "rows": rows,
+        "kpis": kpis,
+        "fresh_rows": fresh_rows,
+        "fresh_kpis": fresh_kpis,
+        "degradations": degradations,
+    }
+
+
+def node_llm(state: AgentState, config: RunnableConfig) -> dict:
     """Node that invokes the LLM with the current messages and tools.
 
+    The LLM timeout holds back AGENT_FALLBACK_RESERVE_MS of the deadline. When
+    less than AGENT_LLM_MIN_BUDGET_MS is left on top of that reserve (or the LLM
+    call times out) the loop is capped and the deterministic pipeline answers.
+
     Args:
         state (AgentState): The current state of the agent.
+        config (RunnableConfig): Graph config carrying the request deadline.
     Returns:
         dict: Updated state with new messages and possibly an answer.
     """
 
+    deadline = Deadline.from_config(config)
+    reserve_ms = settings.AGENT_FALLBACK_RESERVE_MS
+    if not deadline.has_at_least(settings.AGENT_LLM_MIN_BUDGET_MS + reserve_ms):
+        return _degraded_answer(state, _ensure_messages(state, fetch_prompt=False), config)
+
     messages = _ensure_messages(state)
-    llm = _make_llm().bind_tools(list(TOOLS.values()))
-    ai_message = llm.invoke(messages)
+
+    llm = _make_llm(timeout=deadline.timeout(reserve_ms=reserve_ms))
+    try:
+        ai_message = llm.bind_tools(list(TOOLS.values())).invoke(messages)
+    except APITimeoutError:
+        logger.warning("LLM call timed out, capping the agentic loop")
+        return _degraded_answer(state, messages, config)
+
     out = {"messages": messages + [ai_message]}
     if not getattr(ai_message, "tool_calls", None) and ai_message.content:
         out["answer"] = ai_message.content
     return out
 
 
-def node_tools(state: AgentState) -> dict:
+def node_tools(state: AgentState, config: RunnableConfig) -> dict:
     """Node that processes tool calls from the last AI message.
 
     Args:
         state (AgentState): The current state of the agent.
+        config (RunnableConfig): Graph config carrying the request deadline, passed
+            on to the tools.
     Returns:
         dict: Updated state with tool results and messages.
     """
@@ -88,6 +161,8 @@ def node_tools(state: AgentState) -> dict:
 
     tool_messages = []
     rows_update, kpis_update, answer_update = None, None, None
+    # Whether rows/KPIs were produced in this run (vs. left in the checkpoint by an earlier one)
+    fresh_rows, fresh_kpis = bool(state.get("fresh_rows")), bool(state.get("fresh_kpis"))
 
     for call in last_ai_message.tool_calls:
         call_id = call.get("id")
@@ -108,7 +183,7 @@ def node_tools(state: AgentState) -> dict:
         args = call.get("args") or call.get("arguments") or {}
         try:
             result = (
-                function_tool.invoke(args)
+                function_tool.invoke(args, config=config)
                 if hasattr(function_tool, "invoke")
                 else function_tool(**args)
             )
@@ -119,10 +194,10 @@ def node_tools(state: AgentState) -> dict:
             continue
 
         if name == "fetch_stats":
-            rows_update = result
+            rows_update, fresh_rows = result, True
             obs = json.dumps({"rows_preview_count": min(5, len(result)), "count": len(result)})
         elif name == "compute_kpis":
-            kpis_update = result
+            kpis_update, fresh_kpis = result, fresh_rows
             obs = json.dumps({"kpis": result})
         elif name == "compute_conclusions":
             answer_update = (result or {}).get("advice", "") or "ok"
@@ -135,8 +210,10 @@ def node_tools(state: AgentState) -> dict:
     out = {"messages": messages + tool_messages}
     if rows_update is not None:
         out["rows"] = rows_update
+        out["fresh_rows"] = fresh_rows
     if kpis_update is not None:
         out["kpis"] = kpis_update
+        out["fresh_kpis"] = fresh_kpis
     if answer_update is not None:
         out["answer"] = answer_update
     return out
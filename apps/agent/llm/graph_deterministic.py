@@ -1,27 +1,59 @@
 from __future__ import annotations
 
+import logging
+
+import requests
+from apps.agent.core.config import settings
+from apps.agent.core.deadline import Deadline
+from apps.agent.llm.constants import (
+    CONTENT_NO_CONCLUSIONS,
+    DEGRADATION_CACHED_KPIS,
+    DEGRADATION_SKIP_LLM_REWRITE,
+)
 from apps.agent.llm.factory import _make_llm
 from apps.agent.llm.tools import compute_conclusions, compute_kpis, fetch_stats
 from apps.agent.schemas.agent import AgentState
+from langchain_core.runnables import RunnableConfig
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import END, START, StateGraph
+from openai import APITimeoutError
 
+logger = logging.getLogger(__name__)
 
-def node_fetch_rows(state: AgentState) -> AgentState:
+
+def node_fetch_rows(state: AgentState, config: RunnableConfig) -> AgentState:
     """Call to the API to fetch rows, writes them in state.
 
+    When the deadline leaves no room for the API call (or the call times out) and
+    the thread checkpoint already holds KPIs, those cached KPIs are reused.
+
     Args:
         state (AgentState): Current state with 'user_id', 'start', and 'end
+        config (RunnableConfig): Graph config carrying the request deadline.
     Returns:
-        AgentState: Updated state with 'rows'.
+        AgentState: Updated state with 'rows' or the 'cached_kpis' degradation.
     """
-    rows = fetch_stats.invoke(
-        {
-            "user_id": state["user_id"],
-            "start": state["start"],
-            "end": state["end"],
-        }
-    )
+    deadline = Deadline.from_config(config)
+    degradations = state.get("degradations") or []
+
+    if state.get("kpis") and not deadline.has_at_least(settings.AGENT_FETCH_MIN_BUDGET_MS):
+        return {"degradations": degradations + [DEGRADATION_CACHED_KPIS]}
+
+    try:
+        rows = fetch_stats.invoke(
+            {
+                "user_id": state["user_id"],
+                "start": state["start"],
+                "end": state["end"],
+            },
+            config=config,
+        )
+    except requests.Timeout:
+        if not state.get("kpis"):
+            raise
+        logger.warning("fetch_stats timed out, using cached KPIs for %s", state["user_id"])
+        return {"degradations": degradations + [DEGRADATION_CACHED_KPIS]}
+
     return {"rows": rows}
 
 
@@ -33,36 +65,57 @@ def node_calc_kpis(state: AgentState) -> AgentState:
     Returns:
         AgentState: Updated state with 'kpis'.
     """
+    if DEGRADATION_CACHED_KPIS in (state.get("degradations") or []):
+        return {"kpis": state["kpis"]}
+
     kpis = compute_kpis.invoke({"rows": state["rows"]})
     return {"kpis": kpis}
 
 
-def node_conclude(state: AgentState) -> AgentState:
+def node_conclude(state: AgentState, config: RunnableConfig) -> AgentState:
     """Generate conclusions based on KPIs and goal, writes answer in state.
 
+    The LLM rewrite is skipped, keeping the deterministic advice, when the
+    deadline leaves less than AGENT_LLM_MIN_BUDGET_MS or the LLM call times out.
+
     Args:
         state (AgentState): Current state with 'kpis' and optional 'goal'.
+        config (RunnableConfig): Graph config carrying the request deadline.
     Returns:
-        AgentState: Updated state with 'answer'.
+        AgentState: Updated state with 'answer' and applied 'degradations'.
     """
+    deadline = Deadline.from_config(config)
+    degradations = state.get("degradations") or []
 
     # Use the conclusions tool
     concl = compute_conclusions.invoke(
         {"kpis": state["kpis"], "goal": state.get("goal", "general")}
     )
-    answer_text = concl.get("advice", "Sin conclusiones.")
+    answer_text = concl.get("advice", CONTENT_NO_CONCLUSIONS)
 
     # Optionally, refine with LLM for better formatting
-    llm = _make_llm()
-    if llm is not None:
-        prompt = (
-            "Eres un analista de entrenamiento. Con base en estos KPIs, "
-            "responde en 5 bullets claros y accionables. No inventes datos.\n\n"
-            f"OBJETIVO: {state.get('goal')}\n\nKPIS:\n{state['kpis']}\n\n"
-        )
+    llm = _make_llm(timeout=deadline.timeout())
+    if llm is None:
+        return {"answer": answer_text, "degradations": degradations}
+
+    if not deadline.has_at_least(settings.AGENT_LLM_MIN_BUDGET_MS):
+        return {
+            "answer": answer_text,
+            "degradations": degradations + [DEGRADATION_SKIP_LLM_REWRITE],
+        }
+
+    prompt = (
+        "Eres un analista de entrenamiento. Con base en estos KPIs, "
+        "responde en 5 bullets claros y accionables. No inventes datos.\n\n"
+        f"OBJETIVO: {state.get('goal')}\n\nKPIS:\n{state['kpis']}\n\n"
+    )
+    try:
         answer_text = llm.invoke(prompt).content
+    except APITimeoutError:
+        logger.warning("LLM rewrite timed out, returning deterministic conclusions")
+        degradations = degradations + [DEGRADATION_SKIP_LLM_REWRITE]
 
-    return {"answer": answer_text}
+    return {"answer": answer_text, "degradations": degradations}
 
 
 def build_deterministic_agent_graph():
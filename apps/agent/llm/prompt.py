@@ -1,5 +1,6 @@
 import logging
 
+from apps.agent.core.cache import get_cache, make_key
 from apps.agent.core.langfuse_connection import get_langfuse
 
 logger = logging.getLogger(__name__)
@@ -15,6 +16,11 @@ def retrieve_prompt(prompt_name: str, variables: dict = None) -> str | None:
     Returns:
         str | None: The formatted prompt string, or None if retrieval fails.
     """
+    cache_key = make_key("prompt", prompt_name, variables or {})
+    cached_prompt = get_cache().get(cache_key)
+    if cached_prompt is not None:
+        return cached_prompt
+
     lf = get_langfuse().client
     if not lf:
         logger.warning("Langfuse client not initialized.")
@@ -27,6 +33,7 @@ def retrieve_prompt(prompt_name: str, variables: dict = None) -> str | None:
             return None
 
         compiled_text = prompt_obj.compile(**(variables or {}))
+        get_cache().set(cache_key, compiled_text)
         return compiled_text
     except Exception as e:
         logger.warning("retrieve_prompt failed for %s: %s", prompt_name, e)
@@ -2,13 +2,17 @@ import os
 
 import pandas as pd
 import requests
+from apps.agent.core.cache import get_cache, is_closed_range, make_key
+from apps.agent.core.config import settings
+from apps.agent.core.deadline import Deadline
 from langchain.tools import tool
+from langchain_core.runnables import RunnableConfig
 
 API_BASE = os.getenv("STATS_API_BASE_URL", "http://api:8000")
 
 
 @tool("fetch_stats")
-def fetch_stats(user_id: str, start: str, end: str) -> list:
+def fetch_stats(user_id: str, start: str, end: str, config: RunnableConfig) -> list:
     """
     NAME: fetch_stats
     PURPOSE: Get raw training rows from the Statistics API for the given user and date range.
@@ -29,6 +33,13 @@ def fetch_stats(user_id: str, start: str, end: str) -> list:
       fetch_stats({"user_id":"123","start":"2025-09-01","end":"2025-09-25"})
     """
 
+    # Only closed ranges are cached: an open one changes as workouts are logged
+    cacheable = is_closed_range(start, end)
+    cache_key = make_key("rows", user_id, start, end)
+    cached_rows = get_cache().get(cache_key) if cacheable else None
+    if cached_rows is not None:
+        return cached_rows
+
     url = f"{API_BASE}/api/v1/statistics/{user_id}/stats"
     headers = {
         "accept": "application/json",
@@ -40,9 +51,14 @@ def fetch_stats(user_id: str, start: str, end: str) -> list:
         "end": end,
     }
 
-    resp = requests.get(url, params=params, headers=headers)
+    # The request deadline travels in the (injected, not LLM visible) runnable config
+    timeout = Deadline.from_config(config).timeout(settings.AGENT_FETCH_MIN_BUDGET_MS)
+    resp = requests.get(url, params=params, headers=headers, timeout=timeout)
     resp.raise_for_status()
-    return resp.json()
+    rows = resp.json()
+    if cacheable:
+        get_cache().set(cache_key, rows)
+    return rows
 
 
 @tool("compute_kpis")
@@ -64,6 +80,11 @@ def compute_kpis(rows: list) -> dict:
     EXAMPLE CALL:
       compute_conclusions({"kpis":{...}, "goal":"fuerza"})
     """
+    cache_key = make_key("kpis", rows)
+    cached_kpis = get_cache().get(cache_key)
+    if cached_kpis is not None:
+        return cached_kpis
+
     df = pd.DataFrame(rows)
     if df.empty:
         return {"summary": "sin datos", "by_muscle": [], "alerts": []}
@@ -120,11 +141,13 @@ def compute_kpis(rows: list) -> dict:
                 }
             )
 
-    return {
+    kpis = {
         "summary": "ok",
         "by_muscle": by_muscle.to_dict(orient="records"),
         "alerts": alerts[-10:],
     }
+    get_cache().set(cache_key, kpis)
+    return kpis
 
 
 @tool("compute_conclusions")
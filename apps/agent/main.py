@@ -1,4 +1,5 @@
 from apps.agent.api.routes import agent
+from apps.agent.core.cache import get_cache
 from apps.agent.core.config import settings
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
@@ -15,6 +16,9 @@ app.add_middleware(
 )
 app.include_router(agent.router, prefix="/v1/agent", tags=["agent"])
 
+# Build the cache at startup: a misconfigured shared backend must stop the worker
+get_cache()
+
 
 @app.get("/health")
 def health():
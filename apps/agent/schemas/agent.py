@@ -13,7 +13,11 @@ class AgentState(TypedDict, total=False):
 
     rows: List[Dict[str, Any]]
     kpis: Dict[str, Any]
+    # True when rows/kpis were produced in the current run, not left by an earlier one
+    fresh_rows: bool
+    fresh_kpis: bool
 
     answer: str
+    degradations: List[str]
     __ai_msg__: Optional[AIMessage]
     messages: List[BaseMessage]
@@ -1,6 +1,6 @@
 from typing import Any, Dict, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class SummaryRequest(BaseModel):
@@ -10,6 +10,7 @@ class SummaryRequest(BaseModel):
     end: str
     goal: Optional[str] = None
     question: str = "Resumen del periodo"
+    deadline_ms: Optional[int] = Field(default=None, gt=0)
 
 
 class SummaryResponse(BaseModel):
@@ -0,0 +1,93 @@
+import os
+
+# Settings are read at import time: pin a hermetic environment before importing the app
+os.environ.update(
+    {
+        "AGENT_DATA_SOURCE": "mock",
+        "AGENT_MODE": "deterministic",
+        "LLM_PROVIDER": "none",
+        "OPENAI_API_KEY": "",
+        "LANGFUSE_SECRET_API_KEY": "",
+        "LANGFUSE_PUBLIC_API_KEY": "",
+        "LANGFUSE_SERVER_URL": "",
+        "AGENT_GYM_PROMPT_NAME": "",
+        "AGENT_DEFAULT_DEADLINE_MS": "",
+        "AGENT_CACHE_BACKEND": "none",
+    }
+)
+
+import pytest  # noqa: E402
+from apps.agent.api.routes import agent as agent_route  # noqa: E402
+from apps.agent.llm import tools  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+ROWS = [
+    {"date": "2025-09-01", "exercise": "squat", "muscle_group": "LEGS", "weight": 100,
+     "reps": 5, "set": 1, "rpe": 8, "rir": 2},
+    {"date": "2025-09-03", "exercise": "row", "muscle_group": "BACK", "weight": 60,
+     "reps": 8, "set": 1, "rpe": 7, "rir": 3},
+]  # fmt: skip
+
+
+class _StatsResponse:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def raise_for_status(self):
+        return None
+
+    def json(self):
+        return self._rows
+
+
+class StatsApi:
+    """Stand-in for `requests.get` against the Statistics API."""
+
+    def __init__(self, rows=ROWS):
+        self.rows = rows
+        self.calls = 0
+        self.error = None
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return _StatsResponse(self.rows)
+
+
+class RecordingGraph:
+    """Stand-in for the compiled graph, recording every invocation config."""
+
+    def __init__(self):
+        self.configs = []
+
+    @property
+    def calls(self):
+        return len(self.configs)
+
+    def invoke(self, state, config):
+        self.configs.append(config)
+        return {"answer": "ok", "kpis": {"summary": "ok"}, "degradations": []}
+
+
+@pytest.fixture
+def stats_api(monkeypatch):
+    api = StatsApi()
+    monkeypatch.setattr(tools.requests, "get", api)
+    return api
+
+
+@pytest.fixture
+def graph(monkeypatch):
+    graph = RecordingGraph()
+    monkeypatch.setattr(agent_route, "_select_graph", lambda: graph)
+    return graph
+
+
+@pytest.fixture
+def client(graph):
+    """Client for the agent router, answered by the `graph` stand-in."""
+    app = FastAPI()
+    app.include_router(agent_route.router)
+    return TestClient(app)
@@ -0,0 +1,195 @@
+import sqlite3
+import time
+from datetime import date, timedelta
+
+import fakeredis
+import pytest
+import redis
+from apps.agent.api.routes import agent as agent_route
+from apps.agent.core import cache as cache_module
+from apps.agent.core.cache import (
+    CACHE_VERSION,
+    InProcessCache,
+    RedisCache,
+    SQLiteCache,
+    dumps,
+    is_closed_range,
+    loads,
+    make_key,
+)
+from apps.agent.core.config import settings
+from apps.agent.llm import tools
+
+TODAY = date.today()
+
+
+def test_dumps_round_trip_small_value_is_raw_json():
+    value = {"summary": "ok", "alerts": []}
+
+    blob = dumps(value)
+
+    assert blob.startswith(b"j")
+    assert loads(blob) == value
+
+
+def test_dumps_round_trip_large_value_is_compressed():
+    value = [{"muscle_group": "LEGS", "kg": 100.5, "reps": i} for i in range(200)]
+
+    blob = dumps(value)
+
+    assert blob.startswith(b"z")
+    assert len(blob) < len(dumps(value[:1])) * 200
+    assert loads(blob) == value
+
+
+def test_make_key_is_versioned_and_stable():
+    key = make_key("rows", "1", "2025-09-01", "2025-09-29")
+
+    assert key.startswith(f"agent:v{CACHE_VERSION}:rows:")
+    assert key == make_key("rows", "1", "2025-09-01", "2025-09-29")
+    assert key != make_key("rows", "2", "2025-09-01", "2025-09-29")
+
+
+@pytest.mark.parametrize(
+    "start, end, closed",
+    [
+        ("2025-09-01", "2025-09-29", True),
+        (str(TODAY - timedelta(days=30)), str(TODAY - timedelta(days=2)), True),
+        (str(TODAY - timedelta(days=30)), str(TODAY - timedelta(days=1)), False),
+        (str(TODAY - timedelta(days=30)), str(TODAY), False),
+        ("2025-09-29", "2025-09-01", False),
+        ("not-a-date", "2025-09-29", False),
+    ],
+)
+def test_is_closed_range(start, end, closed):
+    assert is_closed_range(start, end) is closed
+
+
+def test_in_process_cache_ttl_expiry():
+    cache = InProcessCache()
+
+    cache.set("live", 1, ttl=60)
+    cache.set("expired", 2, ttl=0)
+
+    assert cache.get("live") == 1
+    assert cache.get("expired") is None
+
+
+def test_in_process_cache_evicts_least_recently_used():
+    cache = InProcessCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+
+def test_sqlite_cache_ttl_expiry(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"))
+
+    cache.set("live", {"a": 1}, ttl=60)
+    cache.set("expired", {"a": 2}, ttl=0)
+
+    assert cache.get("live") == {"a": 1}
+    assert cache.get("expired") is None
+
+
+def test_sqlite_cache_is_shared_in_wal_mode(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    writer, reader = SQLiteCache(path), SQLiteCache(path)
+
+    writer.set("key", [1, 2, 3])
+
+    assert reader.get("key") == [1, 2, 3]
+    with sqlite3.connect(path) as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_sqlite_cache_does_not_wait_on_a_locked_database(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = SQLiteCache(path, timeout=0.05)
+    locker = sqlite3.connect(path, isolation_level=None)
+    locker.execute("BEGIN IMMEDIATE")
+
+    started = time.monotonic()
+    cache.set("key", 1)
+
+    assert time.monotonic() - started < 1
+    locker.execute("ROLLBACK")
+    assert cache.get("key") is None
+
+
+def test_sqlite_cache_prunes_expired_entries(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = SQLiteCache(path)
+    cache._PRUNE_EVERY = 2
+
+    cache.set("expired", 1, ttl=0)
+    cache.set("live", 2, ttl=60)
+
+    with sqlite3.connect(path) as connection:
+        assert [row[0] for row in connection.execute("SELECT key FROM cache")] == ["live"]
+
+
+def test_redis_cache_on_local_stand_in():
+    client = fakeredis.FakeRedis()
+    cache = RedisCache(client)
+
+    cache.set("key", {"a": 1}, ttl=60)
+
+    assert cache.get("key") == {"a": 1}
+    assert 0 < client.ttl("key") <= 60
+    assert cache.get("missing") is None
+
+
+def test_unreachable_shared_backend_fails(monkeypatch):
+    monkeypatch.setattr(settings, "AGENT_CACHE_BACKEND", "redis")
+    monkeypatch.setattr(settings, "AGENT_CACHE_REDIS_URL", "redis://127.0.0.1:1/0")
+
+    with pytest.raises(redis.ConnectionError):
+        cache_module._make_cache()
+
+
+def test_unknown_backend_fails(monkeypatch):
+    monkeypatch.setattr(settings, "AGENT_CACHE_BACKEND", "memcached")
+
+    with pytest.raises(ValueError):
+        cache_module._make_cache()
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = InProcessCache()
+    monkeypatch.setattr(agent_route, "get_cache", lambda: cache)
+    monkeypatch.setattr(tools, "get_cache", lambda: cache)
+    return cache
+
+
+@pytest.mark.parametrize(
+    "end, cached",
+    [("2025-09-29", True), (str(TODAY), False)],
+)
+def test_summary_is_cached_only_for_closed_ranges(cache, client, graph, end, cached):
+    body = {"user_id": "1", "start": "2025-09-01", "end": end}
+
+    client.post("/v1/agent/summary", json=body)
+    second = client.post("/v1/agent/summary", json=body).json()
+
+    assert graph.calls == (1 if cached else 2)
+    assert second["usage"]["cached"] is cached
+
+
+@pytest.mark.parametrize(
+    "end, calls",
+    [("2025-09-29", 1), (str(TODAY), 2)],
+)
+def test_rows_are_cached_only_for_closed_ranges(cache, stats_api, end, calls):
+    args = {"user_id": "1", "start": "2025-09-01", "end": end}
+
+    tools.fetch_stats.invoke(args)
+    tools.fetch_stats.invoke(args)
+
+    assert stats_api.calls == calls
@@ -0,0 +1,81 @@
+import time
+
+import pytest
+from apps.agent.core.config import settings
+from apps.agent.core.deadline import DEADLINE_CONFIG_KEY, Deadline
+from apps.agent.llm.tools import fetch_stats
+
+
+def test_no_deadline():
+    deadline = Deadline.from_budget_ms(None)
+
+    assert not deadline.enabled
+    assert deadline.remaining() is None
+    assert deadline.timeout(100) is None
+    assert deadline.has_at_least(10**9)
+
+
+def test_budget_counts_down():
+    deadline = Deadline.from_budget_ms(800)
+
+    assert 0 < deadline.remaining() <= 0.8
+    assert deadline.has_at_least(500)
+    assert not deadline.has_at_least(1000)
+
+
+def test_expired_deadline_timeout_is_floored():
+    deadline = Deadline(time.monotonic() - 1)
+
+    assert deadline.remaining() == 0.0
+    assert not deadline.has_at_least(1)
+    assert deadline.timeout(100) == pytest.approx(0.1)
+
+
+def test_timeout_holds_back_a_reserve():
+    deadline = Deadline.from_budget_ms(1000)
+
+    assert deadline.timeout(reserve_ms=300) <= 0.7
+    assert deadline.timeout(min_ms=100, reserve_ms=2000) == pytest.approx(0.1)
+
+
+def test_config_round_trip():
+    deadline = Deadline.from_budget_ms(800)
+    config = {"configurable": {"thread_id": "t", **deadline.to_configurable()}}
+
+    assert Deadline.from_config(config).expires_at == deadline.expires_at
+    assert not Deadline.from_config({"configurable": {"thread_id": "t"}}).enabled
+    assert not Deadline.from_config(None).enabled
+
+
+def test_fetch_stats_timeout_is_hidden_from_the_llm():
+    assert set(fetch_stats.tool_call_schema.schema()["properties"]) == {"user_id", "start", "end"}
+
+
+BODY = {"user_id": "1", "start": "2025-09-01", "end": "2025-09-29"}
+
+
+@pytest.mark.parametrize(
+    "body, headers, default, expected",
+    [
+        ({**BODY, "deadline_ms": 800}, {"X-Deadline-Ms": "2000"}, 5000, 800),
+        (BODY, {"X-Deadline-Ms": "2000"}, 5000, 2000),
+        (BODY, {}, 5000, 5000),
+        (BODY, {}, None, None),
+    ],
+)
+def test_deadline_precedence(client, graph, monkeypatch, body, headers, default, expected):
+    monkeypatch.setattr(settings, "AGENT_DEFAULT_DEADLINE_MS", default)
+
+    response = client.post("/v1/agent/summary", json=body, headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["usage"]["deadline_ms"] == expected
+    deadline_at = graph.configs[0]["configurable"][DEADLINE_CONFIG_KEY]
+    assert (deadline_at is None) == (expected is None)
+
+
+def test_non_positive_deadline_is_rejected(client):
+
+    assert client.post("/v1/agent/summary", json={**BODY, "deadline_ms": 0}).status_code == 422
+    response = client.post("/v1/agent/summary", json=BODY, headers={"X-Deadline-Ms": "-1"})
+    assert response.status_code == 422
@@ -0,0 +1,198 @@
+import time
+import uuid
+
+import httpx
+import pytest
+import requests
+from apps.agent.core.config import settings
+from apps.agent.core.deadline import Deadline
+from apps.agent.llm import graph_agentic, graph_deterministic, tools
+from apps.agent.llm.constants import (
+    DEGRADATION_AGENTIC_LOOP_CAPPED,
+    DEGRADATION_CACHED_KPIS,
+    DEGRADATION_SKIP_LLM_REWRITE,
+)
+from langchain_core.messages import AIMessage
+from openai import APITimeoutError
+
+EXPIRED = Deadline(time.monotonic() - 1)
+NO_DEADLINE = Deadline()
+
+
+class _ScriptedLLM:
+    """Chat model returning the scripted items in order (exceptions are raised)."""
+
+    def __init__(self, *script):
+        self.script = list(script)
+
+    def bind_tools(self, _tools):
+        return self
+
+    def invoke(self, _messages):
+        item = self.script.pop(0)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+
+def _invoke(graph, deadline, thread_id=None):
+    thread_id = thread_id or str(uuid.uuid4())
+    return graph.invoke(
+        {
+            "input": "Resumen",
+            "user_id": "1",
+            "start": "2025-09-01",
+            "end": "2025-09-29",
+            "goal": "fuerza",
+            "degradations": [],
+            "fresh_rows": False,
+            "fresh_kpis": False,
+        },
+        config={"configurable": {"thread_id": thread_id, **deadline.to_configurable()}},
+    )
+
+
+def _advice(kpis):
+    return tools.compute_conclusions.invoke({"kpis": kpis, "goal": "fuerza"})["advice"]
+
+
+def _tool_call(name, args):
+    return AIMessage(content="", tool_calls=[{"name": name, "args": args, "id": str(uuid.uuid4())}])
+
+
+def test_deterministic_expired_deadline_skips_llm_rewrite(stats_api, monkeypatch):
+    llm = _ScriptedLLM(AIMessage(content="rewritten"))
+    monkeypatch.setattr(graph_deterministic, "_make_llm", lambda timeout=None: llm)
+
+    result = _invoke(graph_deterministic.build_deterministic_agent_graph(), EXPIRED)
+
+    assert result["degradations"] == [DEGRADATION_SKIP_LLM_REWRITE]
+    assert result["answer"] == _advice(result["kpis"])
+    assert llm.script, "the LLM must not be called"
+
+
+def test_deterministic_llm_timeout_skips_llm_rewrite(stats_api, monkeypatch):
+    timeout = APITimeoutError(request=httpx.Request("POST", "https://api.openai.com"))
+    llm = _ScriptedLLM(timeout)
+    monkeypatch.setattr(graph_deterministic, "_make_llm", lambda timeout=None: llm)
+
+    result = _invoke(graph_deterministic.build_deterministic_agent_graph(), NO_DEADLINE)
+
+    assert result["degradations"] == [DEGRADATION_SKIP_LLM_REWRITE]
+    assert result["answer"] == _advice(result["kpis"])
+
+
+def test_deterministic_without_llm_reports_no_degradation(stats_api):
+    result = _invoke(graph_deterministic.build_deterministic_agent_graph(), EXPIRED)
+
+    assert result["degradations"] == []
+    assert result["answer"] == _advice(result["kpis"])
+
+
+def test_deterministic_fetch_timeout_uses_checkpointed_kpis(stats_api):
+    graph = graph_deterministic.build_deterministic_agent_graph()
+    first = _invoke(graph, NO_DEADLINE, thread_id="det-cached")
+
+    stats_api.error = requests.Timeout()
+    second = _invoke(graph, NO_DEADLINE, thread_id="det-cached")
+
+    assert first["degradations"] == []
+    assert second["degradations"] == [DEGRADATION_CACHED_KPIS]
+    assert second["kpis"] == first["kpis"]
+
+
+def test_deterministic_expired_deadline_skips_fetch_with_checkpointed_kpis(stats_api):
+    graph = graph_deterministic.build_deterministic_agent_graph()
+    _invoke(graph, NO_DEADLINE, thread_id="det-expired")
+
+    result = _invoke(graph, EXPIRED, thread_id="det-expired")
+
+    assert stats_api.calls == 1
+    assert result["degradations"] == [DEGRADATION_CACHED_KPIS]
+
+
+def test_deterministic_fetch_timeout_without_checkpoint_fails(stats_api):
+    stats_api.error = requests.Timeout()
+
+    with pytest.raises(requests.Timeout):
+        _invoke(graph_deterministic.build_deterministic_agent_graph(), NO_DEADLINE)
+
+
+def test_agentic_expired_deadline_caps_the_loop(stats_api, monkeypatch):
+    llm = _ScriptedLLM()
+    monkeypatch.setattr(graph_agentic, "_make_llm", lambda timeout=None: llm)
+
+    result = _invoke(graph_agentic.build_agentic_graph(), EXPIRED)
+
+    assert stats_api.calls == 1
+    assert result["degradations"] == [DEGRADATION_AGENTIC_LOOP_CAPPED]
+    assert result["kpis"]["by_muscle"]
+    assert result["answer"] == _advice(result["kpis"])
+
+
+def test_agentic_llm_timeout_keeps_a_reserve_for_the_fallback(stats_api, monkeypatch):
+    timeouts = []
+    timeout = APITimeoutError(request=httpx.Request("POST", "https://api.openai.com"))
+    llm = _ScriptedLLM(timeout)
+    monkeypatch.setattr(
+        graph_agentic, "_make_llm", lambda timeout=None: timeouts.append(timeout) or llm
+    )
+
+    result = _invoke(graph_agentic.build_agentic_graph(), Deadline.from_budget_ms(2000))
+
+    assert timeouts[0] <= 2 - settings.AGENT_FALLBACK_RESERVE_MS / 1000
+    assert result["degradations"] == [DEGRADATION_AGENTIC_LOOP_CAPPED]
+    assert result["answer"] == _advice(result["kpis"])
+
+
+def test_agentic_llm_timeout_answers_with_fresh_kpis(stats_api, monkeypatch):
+    timeout = APITimeoutError(request=httpx.Request("POST", "https://api.openai.com"))
+    llm = _ScriptedLLM(
+        _tool_call("fetch_stats", {"user_id": "1", "start": "a", "end": "b"}), timeout
+    )
+    monkeypatch.setattr(graph_agentic, "_make_llm", lambda timeout=None: llm)
+
+    result = _invoke(graph_agentic.build_agentic_graph(), NO_DEADLINE)
+
+    assert result["degradations"] == [DEGRADATION_AGENTIC_LOOP_CAPPED]
+    assert result["answer"] == _advice(result["kpis"])
+
+
+def test_agentic_reports_kpis_of_an_earlier_run(stats_api, monkeypatch):
+    graph = graph_agentic.build_agentic_graph()
+    llm = _ScriptedLLM(
+        _tool_call("fetch_stats", {"user_id": "1", "start": "a", "end": "b"}),
+        _tool_call("compute_kpis", {"rows": stats_api.rows}),
+        AIMessage(content="final"),
+    )
+    monkeypatch.setattr(graph_agentic, "_make_llm", lambda timeout=None: llm)
+    first = _invoke(graph, NO_DEADLINE, thread_id="agentic-cached")
+
+    second = _invoke(graph, EXPIRED, thread_id="agentic-cached")
+
+    assert first["degradations"] == []
+    assert second["degradations"] == [DEGRADATION_AGENTIC_LOOP_CAPPED, DEGRADATION_CACHED_KPIS]
+    assert second["answer"] == _advice(first["kpis"])
+    assert stats_api.calls == 1
+
+
+def test_agentic_reuse_of_earlier_kpis_without_deadline_is_not_a_degradation(
+    stats_api, monkeypatch
+):
+    graph = graph_agentic.build_agentic_graph()
+    llm = _ScriptedLLM(
+        _tool_call("fetch_stats", {"user_id": "1", "start": "a", "end": "b"}),
+        _tool_call("compute_kpis", {"rows": stats_api.rows}),
+        AIMessage(content="final"),
+    )
+    monkeypatch.setattr(graph_agentic, "_make_llm", lambda timeout=None: llm)
+    first = _invoke(graph, NO_DEADLINE, thread_id="agentic-reuse")
+    llm.script = [
+        _tool_call("compute_conclusions", {"kpis": first["kpis"], "goal": "fuerza"}),
+        AIMessage(content="final again"),
+    ]
+
+    second = _invoke(graph, NO_DEADLINE, thread_id="agentic-reuse")
+
+    assert second["degradations"] == []
+    assert second["answer"] == "final again"